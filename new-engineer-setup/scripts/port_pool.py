@@ -0,0 +1,379 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = []
+# ///
+"""Host-wide port allocator for orchestrator instances.
+
+Reservations live in a SQLite ledger shared by every project on the host
+(~/.cache/claude-ports/ledger.sqlite, override with PORT_LEDGER). Each
+allocation runs inside a single BEGIN IMMEDIATE transaction, so concurrent
+spawns serialize on the ledger instead of racing on the same ports: the
+`ports` table's primary key makes a double booking impossible.
+
+An instance gets a contiguous block of ports. The preferred block is
+derived from a hash of project/instance, so the same instance lands on the
+same ports when they are free. Leases recorded with a PID are reclaimed
+once that process is gone.
+
+--env-out renders env.sample.txt for a new instance. An existing .env is
+updated in place (only APP_NAME, HOST, PORT and PORT_n change), so re-running
+a spawn keeps its secrets; --force re-renders it from the template.
+
+Usage:
+    uv run scripts/port_pool.py allocate myproj 1 --env-out ../myproj-1/.env
+    uv run scripts/port_pool.py allocate myproj 1 --env-out ../myproj-1/.env --force   # re-render from template
+    uv run scripts/port_pool.py allocate myproj 2 --count 3 --pid 4242
+    uv run scripts/port_pool.py release myproj 1
+    uv run scripts/port_pool.py list
+    uv run scripts/port_pool.py reclaim
+    uv run scripts/port_pool.py stress --allocations 500 --workers 64
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import socket
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+LEDGER_PATH = Path(os.environ.get("PORT_LEDGER", Path.home() / ".cache" / "claude-ports" / "ledger.sqlite"))
+RANGE_START = 8000
+RANGE_END = 9999
+DEFAULT_HOST = "127.0.0.1"
+KIT_TEMPLATE = Path(__file__).resolve().parent.parent.parent / "project-boilerplate" / "env.sample.txt"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    project TEXT NOT NULL,
+    instance TEXT NOT NULL,
+    base_port INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    pid INTEGER,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (project, instance)
+);
+CREATE TABLE IF NOT EXISTS ports (
+    port INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    instance TEXT NOT NULL
+);
+"""
+
+
+class AllocationError(Exception):
+    pass
+
+
+@dataclass
+class Lease:
+    project: str
+    instance: str
+    base_port: int
+    count: int
+    pid: int | None
+
+    @property
+    def ports(self) -> list[int]:
+        return list(range(self.base_port, self.base_port + self.count))
+
+
+# ─── Ledger ────────────────────────────────────────────────────────
+
+
+def connect(ledger: Path = LEDGER_PATH) -> sqlite3.Connection:
+    ledger.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(ledger, timeout=60, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _port_free(host: str, port: int) -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((host, port))
+        except OSError:
+            return False
+    return True
+
+
+def _drop_lease(conn: sqlite3.Connection, project: str, instance: str) -> None:
+    conn.execute("DELETE FROM ports WHERE project = ? AND instance = ?", (project, instance))
+    conn.execute("DELETE FROM leases WHERE project = ? AND instance = ?", (project, instance))
+
+
+def _reclaim_dead(conn: sqlite3.Connection) -> int:
+    """Drop leases whose PID has exited. Each distinct PID is checked once."""
+    rows = conn.execute("SELECT project, instance, pid FROM leases WHERE pid IS NOT NULL").fetchall()
+    alive = {pid: pid_alive(pid) for pid in {row[2] for row in rows}}
+    dead = [(project, instance) for project, instance, pid in rows if not alive[pid]]
+    for project, instance in dead:
+        _drop_lease(conn, project, instance)
+    return len(dead)
+
+
+def _preferred_slot(project: str, instance: str, slots: int) -> int:
+    digest = hashlib.sha256(f"{project}/{instance}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") % slots
+
+
+def allocate(
+    conn: sqlite3.Connection,
+    project: str,
+    instance: str,
+    count: int = 1,
+    pid: int | None = None,
+    host: str = DEFAULT_HOST,
+    check_bind: bool = True,
+) -> Lease:
+    """Reserve count contiguous ports for project/instance, or return its existing lease."""
+    if not 1 <= count <= RANGE_END - RANGE_START + 1:
+        raise AllocationError(f"count must be between 1 and {RANGE_END - RANGE_START + 1}, got {count}")
+    slots = (RANGE_END - RANGE_START + 1) // count
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        _reclaim_dead(conn)
+        row = conn.execute(
+            "SELECT base_port, count, pid FROM leases WHERE project = ? AND instance = ?", (project, instance)
+        ).fetchone()
+        if row and row[1] == count:
+            if pid is not None and row[2] != pid:
+                conn.execute("UPDATE leases SET pid = ? WHERE project = ? AND instance = ?", (pid, project, instance))
+            conn.execute("COMMIT")
+            return Lease(project, instance, row[0], row[1], pid if pid is not None else row[2])
+        if row:
+            _drop_lease(conn, project, instance)
+
+        taken = {port for (port,) in conn.execute("SELECT port FROM ports")}
+        first = _preferred_slot(project, instance, slots)
+        for offset in range(slots):
+            base = RANGE_START + ((first + offset) % slots) * count
+            block = range(base, base + count)
+            if any(port in taken for port in block):
+                continue
+            if check_bind and not all(_port_free(host, port) for port in block):
+                continue
+            conn.execute(
+                "INSERT INTO leases (project, instance, base_port, count, pid, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (project, instance, base, count, pid, time.time()),
+            )
+            conn.executemany(
+                "INSERT INTO ports (port, project, instance) VALUES (?, ?, ?)",
+                [(port, project, instance) for port in block],
+            )
+            conn.execute("COMMIT")
+            return Lease(project, instance, base, count, pid)
+        raise AllocationError(f"no free block of {count} ports in {RANGE_START}-{RANGE_END}")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def release(conn: sqlite3.Connection, project: str, instance: str) -> bool:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        existed = conn.execute(
+            "SELECT 1 FROM leases WHERE project = ? AND instance = ?", (project, instance)
+        ).fetchone()
+        _drop_lease(conn, project, instance)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return existed is not None
+
+
+def reclaim(conn: sqlite3.Connection) -> int:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        count = _reclaim_dead(conn)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return count
+
+
+def list_leases(conn: sqlite3.Connection) -> list[Lease]:
+    rows = conn.execute("SELECT project, instance, base_port, count, pid FROM leases ORDER BY base_port")
+    return [Lease(*row) for row in rows]
+
+
+# ─── .env generation ───────────────────────────────────────────────
+
+
+def write_env(lease: Lease, template: Path | None, out: Path, host: str = DEFAULT_HOST, force: bool = False) -> None:
+    """Write this lease's APP_NAME/HOST/PORT/PORT_n into out, in one read and one atomic write.
+
+    An existing out is updated in place so secrets and other settings survive a
+    re-run; only with force is it re-rendered from template.
+    """
+    source = out if out.exists() and not force else template
+    if source is None:
+        raise ValueError("a template is required when the .env does not exist yet")
+    values = {
+        "APP_NAME": f"{lease.project}-{lease.instance}",
+        "HOST": host,
+        "PORT": str(lease.base_port),
+    }
+    values.update({f"PORT_{n}": str(port) for n, port in enumerate(lease.ports[1:], 1)})
+
+    lines = []
+    for line in source.read_text(encoding="utf-8").splitlines():
+        key = line.split("=", 1)[0].strip()
+        if not line.lstrip().startswith("#"):
+            if key in values:
+                line = f"{key}={values.pop(key)}"
+            elif re.fullmatch(r"PORT_\d+", key):
+                continue  # left over from a larger --count
+        lines.append(line)
+    lines.extend(f"{key}={value}" for key, value in values.items())
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    tmp.replace(out)
+
+
+# ─── Stress test ───────────────────────────────────────────────────
+
+
+def _stress_worker(ledger: str, instance: int, count: int) -> tuple[float, list[int], str | None]:
+    conn = connect(Path(ledger))
+    start = time.perf_counter()
+    ports, error = [], None
+    try:
+        ports = allocate(conn, "stress", str(instance), count=count, pid=os.getpid(), check_bind=False).ports
+    except AllocationError as e:
+        error = str(e)
+    finally:
+        conn.close()
+    return (time.perf_counter() - start) * 1000, ports, error
+
+
+def run_stress(allocations: int, workers: int, count: int) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        ledger = str(Path(tmp) / "ledger.sqlite")
+        connect(Path(ledger)).close()
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_stress_worker, [ledger] * allocations, range(allocations), [count] * allocations))
+        wall = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _, _ in results)
+    all_ports = [port for _, ports, _ in results for port in ports]
+    failures = [error for _, _, error in results if error]
+    collisions = len(all_ports) - len(set(all_ports))
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"allocations: {allocations} x {count} ports, {workers} concurrent workers, wall {wall:.2f}s")
+    print(f"latency:     p50 {statistics.median(latencies):.2f}ms  p99 {p99:.2f}ms  max {latencies[-1]:.2f}ms")
+    print(f"collisions:  {collisions} ({collisions / max(1, len(all_ports)):.2%})")
+    print(f"failures:    {len(failures)}" + (f" (first: {failures[0]})" if failures else ""))
+    return 1 if collisions or failures else 0
+
+
+# ─── CLI ───────────────────────────────────────────────────────────
+
+
+def _resolve_template(parser: argparse.ArgumentParser, template: Path | None) -> Path:
+    """Use an explicit --template if it exists, else the first env.sample.txt found."""
+    if template is not None:
+        if not template.is_file():
+            parser.error(f"template not found: {template}")
+        return template
+    for candidate in (Path("env.sample.txt"), KIT_TEMPLATE):
+        if candidate.is_file():
+            return candidate
+    parser.error("no env.sample.txt in the current directory or the boilerplate, pass --template")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ledger", type=Path, default=LEDGER_PATH, help="SQLite ledger path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    alloc = sub.add_parser("allocate", help="Reserve ports for an instance")
+    alloc.add_argument("project")
+    alloc.add_argument("instance")
+    alloc.add_argument("--count", type=int, default=1, help="Contiguous ports to reserve")
+    alloc.add_argument("--pid", type=int, help="Release automatically once this process exits")
+    alloc.add_argument("--host", default=DEFAULT_HOST)
+    alloc.add_argument("--env-out", type=Path, help="Write a per-instance .env here")
+    alloc.add_argument(
+        "--template", type=Path, help=".env template (default: ./env.sample.txt, else the boilerplate's)"
+    )
+    alloc.add_argument("--force", action="store_true", help="Re-render an existing --env-out from the template")
+    alloc.add_argument("--json", action="store_true")
+
+    rel = sub.add_parser("release", help="Free an instance's ports")
+    rel.add_argument("project")
+    rel.add_argument("instance")
+
+    sub.add_parser("list", help="Show current leases")
+    sub.add_parser("reclaim", help="Free leases whose PID has exited")
+
+    stress = sub.add_parser("stress", help="Concurrent allocation stress test on a scratch ledger")
+    stress.add_argument("--allocations", type=int, default=300)
+    stress.add_argument("--workers", type=int, default=64)
+    stress.add_argument("--count", type=int, default=2)
+
+    args = parser.parse_args()
+
+    if args.command in ("allocate", "stress") and not 1 <= args.count <= RANGE_END - RANGE_START + 1:
+        parser.error(f"--count must be between 1 and {RANGE_END - RANGE_START + 1}")
+    if args.command == "stress":
+        return run_stress(args.allocations, args.workers, args.count)
+
+    if args.command == "allocate" and args.env_out and (args.force or not args.env_out.exists()):
+        args.template = _resolve_template(parser, args.template)
+
+    conn = connect(args.ledger)
+    if args.command == "allocate":
+        try:
+            lease = allocate(conn, args.project, args.instance, args.count, args.pid, args.host)
+        except AllocationError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        if args.env_out:
+            write_env(lease, args.template, args.env_out, args.host, args.force)
+        if args.json:
+            print(json.dumps(asdict(lease) | {"ports": lease.ports}))
+        else:
+            print(f"{lease.project}/{lease.instance}: {', '.join(map(str, lease.ports))}")
+    elif args.command == "release":
+        if not release(conn, args.project, args.instance):
+            print(f"No lease for {args.project}/{args.instance}")
+            return 1
+        print(f"Released {args.project}/{args.instance}")
+    elif args.command == "list":
+        for lease in list_leases(conn):
+            pid = f"pid {lease.pid}" if lease.pid else "no pid"
+            name = f"{lease.project}/{lease.instance}"
+            print(f"{name:<24} {lease.base_port}-{lease.ports[-1]}  ({pid})")
+    elif args.command == "reclaim":
+        print(f"Reclaimed {reclaim(conn)} leases")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import os
+import subprocess
+import sys
+
+import port_pool
+import pytest
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = port_pool.connect(tmp_path / "ledger.sqlite")
+    yield conn
+    conn.close()
+
+
+def dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def ledger_ports(conn) -> set[int]:
+    return {port for (port,) in conn.execute("SELECT port FROM ports")}
+
+
+def test_repeat_allocate_returns_same_lease(conn):
+    first = port_pool.allocate(conn, "proj", "1", count=2, check_bind=False)
+    again = port_pool.allocate(conn, "proj", "1", count=2, pid=1234, check_bind=False)
+
+    assert again.ports == first.ports
+    assert again.pid == 1234
+    assert len(port_pool.list_leases(conn)) == 1
+
+
+def test_changed_count_reallocates(conn):
+    first = port_pool.allocate(conn, "proj", "1", count=2, check_bind=False)
+    bigger = port_pool.allocate(conn, "proj", "1", count=3, check_bind=False)
+
+    assert bigger.count == 3
+    assert ledger_ports(conn) == set(bigger.ports)
+    assert len(port_pool.list_leases(conn)) == 1
+    assert first.count == 2
+
+
+def test_instances_never_share_ports(conn):
+    leases = [port_pool.allocate(conn, "proj", str(n), count=3, check_bind=False) for n in range(50)]
+    ports = [port for lease in leases for port in lease.ports]
+    assert len(ports) == len(set(ports))
+
+
+@pytest.mark.parametrize("count", [0, -2, port_pool.RANGE_END - port_pool.RANGE_START + 2])
+def test_invalid_count_is_rejected(conn, count):
+    with pytest.raises(port_pool.AllocationError):
+        port_pool.allocate(conn, "proj", "1", count=count, check_bind=False)
+
+
+def test_reclaim_drops_dead_pids_and_keeps_live_ones(conn):
+    # allocate() reclaims before reserving, so the dead lease goes in last.
+    live = port_pool.allocate(conn, "proj", "live", pid=os.getpid(), check_bind=False)
+    port_pool.allocate(conn, "proj", "nopid", check_bind=False)
+    port_pool.allocate(conn, "proj", "dead", pid=dead_pid(), check_bind=False)
+
+    assert port_pool.reclaim(conn) == 1
+    assert {lease.instance for lease in port_pool.list_leases(conn)} == {"live", "nopid"}
+    assert set(live.ports) <= ledger_ports(conn)
+
+
+def test_release_reports_whether_a_lease_existed(conn):
+    port_pool.allocate(conn, "proj", "1", check_bind=False)
+
+    assert port_pool.release(conn, "proj", "1") is True
+    assert port_pool.release(conn, "proj", "1") is False
+    assert ledger_ports(conn) == set()
+
+
+def test_exhausted_range_raises(conn, monkeypatch):
+    monkeypatch.setattr(port_pool, "RANGE_END", port_pool.RANGE_START + 3)
+    port_pool.allocate(conn, "proj", "1", count=2, check_bind=False)
+    port_pool.allocate(conn, "proj", "2", count=2, check_bind=False)
+    with pytest.raises(port_pool.AllocationError, match="no free block"):
+        port_pool.allocate(conn, "proj", "3", count=2, check_bind=False)
+
+
+# ─── .env generation ───────────────────────────────────────────────
+
+TEMPLATE = """# Application
+APP_NAME=my-project
+ANTHROPIC_API_KEY=sk-ant-...
+# PORT=1 stays commented
+HOST=127.0.0.1
+PORT=8000
+"""
+
+
+def lease(count: int = 1) -> port_pool.Lease:
+    return port_pool.Lease("proj", "2", 8100, count, None)
+
+
+def test_write_env_replaces_keys_and_adds_extra_ports(tmp_path):
+    template = tmp_path / "env.sample.txt"
+    template.write_text(TEMPLATE)
+    out = tmp_path / "inst" / ".env"
+
+    port_pool.write_env(lease(3), template, out, host="0.0.0.0")
+
+    lines = out.read_text().splitlines()
+    assert "APP_NAME=proj-2" in lines
+    assert "HOST=0.0.0.0" in lines
+    assert "PORT=8100" in lines
+    assert lines[-2:] == ["PORT_1=8101", "PORT_2=8102"]
+    assert "# PORT=1 stays commented" in lines
+    assert "ANTHROPIC_API_KEY=sk-ant-..." in lines
+
+
+def test_write_env_keeps_existing_secrets(tmp_path):
+    template = tmp_path / "env.sample.txt"
+    template.write_text(TEMPLATE)
+    out = tmp_path / ".env"
+    port_pool.write_env(lease(3), template, out)
+    out.write_text(out.read_text().replace("sk-ant-...", "real-secret") + "EXTRA=1\n")
+
+    port_pool.write_env(lease(1), template, out)
+
+    text = out.read_text()
+    assert "ANTHROPIC_API_KEY=real-secret" in text
+    assert "EXTRA=1" in text
+    assert "PORT=8100" in text
+    assert "PORT_1" not in text
+
+
+def test_write_env_force_rerenders_from_template(tmp_path):
+    template = tmp_path / "env.sample.txt"
+    template.write_text(TEMPLATE)
+    out = tmp_path / ".env"
+    out.write_text("ANTHROPIC_API_KEY=real-secret\n")
+
+    port_pool.write_env(lease(), template, out, force=True)
+
+    assert "ANTHROPIC_API_KEY=sk-ant-..." in out.read_text()
+
+
+def test_write_env_needs_template_for_new_file(tmp_path):
+    with pytest.raises(ValueError):
+        port_pool.write_env(lease(), None, tmp_path / ".env")
+
+
+# ─── Stress ────────────────────────────────────────────────────────
+
+
+def test_stress_reports_exhaustion_instead_of_crashing(monkeypatch, capsys):
+    monkeypatch.setattr(port_pool, "RANGE_END", port_pool.RANGE_START + 9)
+
+    assert port_pool.run_stress(allocations=5, workers=2, count=5) == 1
+
+    out = capsys.readouterr().out
+    assert "collisions:  0" in out
+    assert "failures:    3" in out
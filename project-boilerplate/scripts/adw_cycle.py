@@ -0,0 +1,316 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = []
+# ///
+"""Run many prompts or specs through plan -> build -> review -> fix in parallel.
+
+Each input becomes a job whose stages run in order. Stages are scheduled as
+(job, stage) tasks: a job's next stage is queued on that stage's pool once
+the previous one finishes, and each pool is sized to the stage's limit, so
+for example only two builds touch the tree at once while other jobs keep
+planning and reviewing. -j caps the total claude processes. Progress is written to a
+state file after every stage, so an interrupted run picks up where it left
+off and completed stages are skipped.
+
+Inputs that are existing files are treated as specs and start at build;
+anything else is a prompt and starts at plan.
+
+The file a stage wrote (spec, review, fix report) is attributed to its job
+deterministically: it is either the one new file the stage printed, or the
+one new file whose name contains the job id, which is exported to the stage as
+ADW_JOB_ID. Otherwise the stage fails rather than guess, since several jobs
+write into the same directories at once.
+
+Usage:
+    uv run scripts/adw_cycle.py specs/*.md
+    uv run scripts/adw_cycle.py "add login page" "add rate limiting" -j 4 --limit build=1
+    uv run scripts/adw_cycle.py specs/a.md --stages build,review
+    uv run scripts/adw_cycle.py specs/a.md --claude ./fake_claude   # any stand-in executable
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATE_PATH = PROJECT_ROOT / ".claude" / "data" / "adw_cycle.json"
+STAGES = ("plan", "build", "review", "fix")
+STAGE_OUTPUT_DIRS = {"plan": "specs", "review": "app_review", "fix": "app_fix_reports"}
+DEFAULT_LIMITS = {"plan": 4, "build": 2, "review": 4, "fix": 2}
+
+
+class StageError(Exception):
+    pass
+
+
+class State:
+    """Thread-safe JSON state file: {job_id: {"input": ..., "stages": {stage: {...}}}}."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data: dict = {}
+        if path.exists():
+            try:
+                self.data = json.loads(path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                self.data = {}
+
+    def job(self, job_id: str, source: str) -> dict:
+        with self.lock:
+            return self.data.setdefault(job_id, {"input": source, "stages": {}})
+
+    def record(self, job_id: str, stage: str, result: dict) -> None:
+        with self.lock:
+            self.data[job_id]["stages"][stage] = result
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+            tmp.replace(self.path)
+
+
+@dataclass
+class Job:
+    id: str
+    source: str
+    prompt: str
+    is_spec: bool
+    record: dict
+    outputs: dict[str, str] = field(default_factory=dict)
+
+
+class Runner:
+    """Runs jobs as (job, stage) tasks on per-stage pools; see the module docstring."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.claude = shlex.split(args.claude) + shlex.split(args.claude_args)
+        self.timeout = args.timeout
+        self.stages = args.stages
+        self.state = State(args.state)
+        self.limits = args.limits
+        self.slots = threading.Semaphore(args.workers)
+        self.print_lock = threading.Lock()
+        self.pending = 0
+        self.done = threading.Condition()
+        self.pools: dict[str, ThreadPoolExecutor] = {}
+
+    def log(self, job_id: str, message: str) -> None:
+        with self.print_lock:
+            print(f"[{job_id}] {message}", flush=True)
+
+    # ─── Stage execution ───────────────────────────────────────────
+
+    def _command(self, stage: str, prompt: str, outputs: dict) -> str:
+        if stage == "plan":
+            return f"/plan {shlex.quote(prompt)}"
+        if stage == "build":
+            return f"/build {outputs['plan']}"
+        if stage == "review":
+            return f"/review {shlex.quote(prompt)} {outputs['plan']}"
+        return f"/fix {shlex.quote(prompt)} {outputs['plan']} {outputs['review']}"
+
+    def _find_output(self, job_id: str, stage: str, stdout: str, before: set[str]) -> str | None:
+        """Locate the file a stage wrote: the one new file it printed, else the one new file tagged with job_id.
+
+        Printed paths that existed before the stage started are ignored, and more than one new
+        candidate is treated as ambiguous rather than picking one.
+        """
+        directory = STAGE_OUTPUT_DIRS[stage]
+        created = _listing(directory) - before
+        printed = set(re.findall(rf"{directory}/[\w./-]+\.md", stdout)) & created
+        if printed:
+            return printed.pop() if len(printed) == 1 else None
+        tagged = [p for p in created if job_id in Path(p).name]
+        return tagged[0] if len(tagged) == 1 else None
+
+    def run_stage(self, job_id: str, stage: str, prompt: str, outputs: dict) -> dict:
+        directory = STAGE_OUTPUT_DIRS.get(stage)
+        before = _listing(directory) if directory else set()
+        try:
+            command = self.claude + ["-p", self._command(stage, prompt, outputs)]
+        except KeyError as e:
+            raise StageError(f"{stage} needs the {e.args[0]} output, run that stage first") from None
+        with self.slots:
+            start = time.perf_counter()
+            try:
+                proc = subprocess.run(
+                    command,
+                    cwd=PROJECT_ROOT,
+                    env=os.environ | {"ADW_JOB_ID": job_id},
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout,
+                )
+            except subprocess.TimeoutExpired as e:
+                raise StageError(f"{stage} timed out after {self.timeout}s") from e
+            except OSError as e:
+                raise StageError(f"could not start {command[0]}: {e}") from e
+            elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or [""]
+            raise StageError(f"{stage} exited {proc.returncode}: {tail[0]}")
+        output = self._find_output(job_id, stage, proc.stdout, before) if directory else None
+        if directory and not output:
+            raise StageError(
+                f"{stage} did not print exactly one new {directory}/ file and no single new file is tagged {job_id}"
+            )
+        return {"status": "done", "seconds": round(elapsed, 2), "output": output}
+
+    # ─── Scheduling ────────────────────────────────────────────────
+
+    def _make_job(self, job_id: str, source: str) -> Job:
+        record = self.state.job(job_id, source)
+        spec = next((p.resolve() for p in (Path(source), PROJECT_ROOT / source) if p.is_file()), None)
+        if spec is None:
+            return Job(job_id, source, source, False, record)
+        in_project = spec.is_relative_to(PROJECT_ROOT)
+        plan = spec.relative_to(PROJECT_ROOT).as_posix() if in_project else str(spec)
+        return Job(job_id, source, f"Implement {plan}", True, record, {"plan": plan})
+
+    def _advance(self, job: Job, index: int) -> None:
+        """Submit the job's next runnable stage from STAGES[index:], or mark the job finished."""
+        for stage in STAGES[index:]:
+            if stage == "plan" and job.is_spec:
+                continue
+            previous = job.record["stages"].get(stage, {})
+            if previous.get("status") == "done":
+                if previous.get("output"):
+                    job.outputs[stage] = previous["output"]
+                self.log(job.id, f"{stage}: already done, skipping")
+                continue
+            if stage not in self.stages:
+                continue
+            self.pools[stage].submit(self._run_task, job, stage)
+            return
+        self._finish()
+
+    def _run_task(self, job: Job, stage: str) -> None:
+        self.log(job.id, f"{stage}: started")
+        try:
+            result = self.run_stage(job.id, stage, job.prompt, job.outputs)
+        except Exception as e:
+            self.state.record(job.id, stage, {"status": "failed", "error": str(e)})
+            self.log(job.id, f"{stage}: FAILED ({e})")
+            self._finish()
+            return
+        self.state.record(job.id, stage, result)
+        if result["output"]:
+            job.outputs[stage] = result["output"]
+        suffix = f" -> {result['output']}" if result["output"] else ""
+        self.log(job.id, f"{stage}: done in {result['seconds']:.1f}s{suffix}")
+        self._advance(job, STAGES.index(stage) + 1)
+
+    def _finish(self) -> None:
+        with self.done:
+            self.pending -= 1
+            self.done.notify_all()
+
+    def run(self, jobs: dict[str, str]) -> dict[str, dict]:
+        """Run every job to completion or failure and return their state records."""
+        self.pools = {
+            stage: ThreadPoolExecutor(max_workers=self.limits[stage], thread_name_prefix=stage) for stage in STAGES
+        }
+        self.pending = len(jobs)
+        try:
+            scheduled = [self._make_job(job_id, source) for job_id, source in jobs.items()]
+            for job in scheduled:
+                self._advance(job, 0)
+            with self.done:
+                self.done.wait_for(lambda: self.pending == 0)
+        finally:
+            for pool in self.pools.values():
+                pool.shutdown(wait=True)
+        return {job.id: job.record for job in scheduled}
+
+
+def _listing(directory: str) -> set[str]:
+    base = PROJECT_ROOT / directory
+    if not base.is_dir():
+        return set()
+    return {p.relative_to(PROJECT_ROOT).as_posix() for p in base.glob("*.md")}
+
+
+def job_id_for(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:8]
+
+
+def print_report(jobs: dict[str, dict], wall: float) -> None:
+    print()
+    print(f"{'job':<10}" + "".join(f"{stage:>10}" for stage in STAGES) + "  input")
+    totals = {stage: [] for stage in STAGES}
+    for job_id, job in jobs.items():
+        cells = []
+        for stage in STAGES:
+            result = job["stages"].get(stage)
+            if not result:
+                cells.append("-")
+            elif result["status"] == "done":
+                cells.append(f"{result['seconds']:.1f}s")
+                totals[stage].append(result["seconds"])
+            else:
+                cells.append("FAILED")
+        source = job["input"] if len(job["input"]) <= 40 else job["input"][:37] + "..."
+        print(f"{job_id:<10}" + "".join(f"{cell:>10}" for cell in cells) + f"  {source}")
+    print(f"{'total':<10}" + "".join(f"{sum(totals[stage]):>9.1f}s" for stage in STAGES) + f"  wall {wall:.1f}s")
+
+
+def _parse_limits(values: list[str]) -> dict[str, int]:
+    limits = dict(DEFAULT_LIMITS)
+    for value in values:
+        stage, _, n = value.partition("=")
+        if stage not in STAGES or not n.isdigit() or int(n) < 1:
+            raise argparse.ArgumentTypeError(f"invalid --limit {value!r}, expected STAGE=N with STAGE in {STAGES}")
+        limits[stage] = int(n)
+    return limits
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="Spec files or prompts")
+    parser.add_argument("-j", "--workers", type=int, default=4, help="claude processes running at once")
+    parser.add_argument("--limit", action="append", default=[], metavar="STAGE=N", help="Per-stage concurrency")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--timeout", type=float, default=3600, help="Per-stage timeout in seconds")
+    parser.add_argument("--state", type=Path, default=STATE_PATH, help="Resumable state file")
+    parser.add_argument("--fresh", action="store_true", help="Ignore previous state for these inputs")
+    parser.add_argument("--claude", default=os.environ.get("CLAUDE_BIN", "claude"), help="claude executable")
+    parser.add_argument("--claude-args", default="", help="Extra arguments passed to every claude call")
+    args = parser.parse_args()
+
+    try:
+        args.limits = _parse_limits(args.limit)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    args.stages = {stage.strip() for stage in args.stages.split(",") if stage.strip()}
+    if unknown := args.stages - set(STAGES):
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    if args.workers < 1:
+        parser.error("-j must be at least 1")
+    runner = Runner(args)
+    jobs = {job_id_for(source): source for source in dict.fromkeys(args.inputs)}
+    if args.fresh:
+        for job_id in jobs:
+            runner.state.data.pop(job_id, None)
+
+    start = time.perf_counter()
+    results = runner.run(jobs)
+    print_report(results, time.perf_counter() - start)
+
+    failed = any(result.get("status") == "failed" for job in results.values() for result in job["stages"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
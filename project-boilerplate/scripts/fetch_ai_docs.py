@@ -0,0 +1,374 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = []
+# ///
+"""Fetch the URLs listed in ai_docs/README.md into local markdown.
+
+Pages are fetched concurrently on a dedicated thread pool sized to the
+requested concurrency; each request opens its own connection (urllib has
+no keep-alive). Each response's ETag / Last-Modified is stored in
+ai_docs/.manifest.json and sent back as a conditional request on the next
+run, so unchanged pages cost a 304 and skip HTML -> markdown conversion.
+Pages whose URL is removed from the README are deleted from ai_docs/.
+
+Usage:
+    uv run scripts/fetch_ai_docs.py                 # refresh ai_docs/
+    uv run scripts/fetch_ai_docs.py --force         # ignore the manifest
+    uv run scripts/fetch_ai_docs.py --bench 100     # cold/warm timing against a local server
+"""
+
+import argparse
+import asyncio
+import codecs
+import hashlib
+import json
+import re
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DOCS_DIR = PROJECT_ROOT / "ai_docs"
+MANIFEST_NAME = ".manifest.json"
+USER_AGENT = "ai-docs-fetcher/1.0"
+
+
+# ─── URL list ──────────────────────────────────────────────────────
+
+
+def read_urls(readme: Path) -> list[str]:
+    """Return the URLs in an ai_docs README, one per line, `#` lines ignored."""
+    urls = []
+    for line in readme.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        line = line.removeprefix("- ").removeprefix("* ").strip()
+        if line.startswith(("http://", "https://")) and line not in urls:
+            urls.append(line)
+    return urls
+
+
+def doc_filename(url: str) -> str:
+    """Map a URL to a stable markdown filename inside ai_docs/.
+
+    Host and path keep the name readable; a short hash of the full URL keeps
+    pages that differ only by host or query string from sharing a file.
+    """
+    parsed = urlparse(url)
+    slug = re.sub(r"[^a-zA-Z0-9]+", "-", f"{parsed.netloc}{parsed.path}").strip("-").lower()
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}.md"
+
+
+# ─── HTML -> markdown ──────────────────────────────────────────────
+
+
+class _MarkdownConverter(HTMLParser):
+    """Minimal HTML to markdown converter for documentation pages."""
+
+    SKIP = {"script", "style", "nav", "header", "footer", "noscript", "svg", "head"}
+    BLOCK = {"p", "div", "section", "article", "main", "table", "tr", "blockquote", "br"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.out: list[str] = []
+        self.skip_depth = 0
+        self.in_pre = False
+        self.list_depth = 0
+        self.href: str | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP:
+            self.skip_depth += 1
+        if self.skip_depth:
+            return
+        if re.fullmatch(r"h[1-6]", tag):
+            self.out.append("\n\n" + "#" * int(tag[1]) + " ")
+        elif tag == "pre":
+            self.in_pre = True
+            self.out.append("\n\n```\n")
+        elif tag == "code" and not self.in_pre:
+            self.out.append("`")
+        elif tag in ("ul", "ol"):
+            self.list_depth += 1
+        elif tag == "li":
+            self.out.append("\n" + "  " * (self.list_depth - 1) + "- ")
+        elif tag == "a":
+            self.href = dict(attrs).get("href")
+            self.out.append("[")
+        elif tag in ("strong", "b"):
+            self.out.append("**")
+        elif tag in ("em", "i"):
+            self.out.append("*")
+        elif tag in self.BLOCK:
+            self.out.append("\n\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+        if tag == "pre":
+            self.in_pre = False
+            self.out.append("\n```\n\n")
+        elif tag == "code" and not self.in_pre:
+            self.out.append("`")
+        elif tag in ("ul", "ol"):
+            self.list_depth = max(0, self.list_depth - 1)
+            self.out.append("\n")
+        elif tag == "a":
+            self.out.append(f"]({self.href})" if self.href else "]")
+            self.href = None
+        elif tag in ("strong", "b"):
+            self.out.append("**")
+        elif tag in ("em", "i"):
+            self.out.append("*")
+        elif re.fullmatch(r"h[1-6]", tag) or tag in self.BLOCK:
+            self.out.append("\n\n")
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        self.out.append(data if self.in_pre else re.sub(r"\s+", " ", data))
+
+
+def html_to_markdown(html: str) -> str:
+    """Convert an HTML page to markdown."""
+    converter = _MarkdownConverter()
+    converter.feed(html)
+    converter.close()
+    text = "".join(converter.out)
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip() + "\n"
+
+
+# ─── Fetching ──────────────────────────────────────────────────────
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: str  # "updated", "not-modified", "unchanged", "error"
+    detail: str = ""
+
+
+def _conditional_get(url: str, entry: dict, timeout: float) -> tuple[int, bytes, dict]:
+    """Blocking GET with If-None-Match / If-Modified-Since from the manifest entry."""
+    headers = {"User-Agent": USER_AGENT}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read(), dict(response.headers)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, b"", dict(e.headers)
+        raise
+
+
+async def _fetch_one(
+    url: str, out_dir: Path, manifest: dict, executor: ThreadPoolExecutor, timeout: float
+) -> FetchResult:
+    loop = asyncio.get_running_loop()
+    entry = manifest.get(url, {})
+    target = out_dir / doc_filename(url)
+    if not target.exists():
+        entry = {}
+    try:
+        status, body, headers = await loop.run_in_executor(executor, _conditional_get, url, entry, timeout)
+    except (urllib.error.URLError, TimeoutError, OSError) as e:
+        return FetchResult(url, "error", str(e))
+
+    if status == 304:
+        return FetchResult(url, "not-modified")
+
+    digest = hashlib.sha256(body).hexdigest()
+    new_entry = {
+        "file": target.name,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "sha256": digest,
+    }
+    if digest == entry.get("sha256"):
+        manifest[url] = new_entry
+        return FetchResult(url, "unchanged")
+
+    charset = "utf-8"
+    match = re.search(r"charset=([\w-]+)", headers.get("Content-Type", ""))
+    if match:
+        try:
+            charset = codecs.lookup(match.group(1)).name
+        except LookupError:
+            pass
+    markdown = await loop.run_in_executor(executor, html_to_markdown, body.decode(charset, errors="replace"))
+    target.write_text(f"<!-- source: {url} -->\n\n{markdown}", encoding="utf-8")
+    manifest[url] = new_entry
+    return FetchResult(url, "updated")
+
+
+def load_manifest(out_dir: Path) -> dict:
+    path = out_dir / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_manifest(out_dir: Path, manifest: dict) -> None:
+    path = out_dir / MANIFEST_NAME
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _remove_stale(out_dir: Path, previous: dict, current: dict) -> None:
+    keep = {entry.get("file") for entry in current.values()}
+    for entry in previous.values():
+        name = entry.get("file")
+        if name and name not in keep and Path(name).name == name:
+            (out_dir / name).unlink(missing_ok=True)
+
+
+async def fetch_all(
+    urls: list[str], out_dir: Path, concurrency: int = 8, timeout: float = 30.0, force: bool = False
+) -> list[FetchResult]:
+    """Fetch every URL into out_dir, reusing the manifest unless force is set.
+
+    Files recorded for URLs that are no longer listed (or whose filename
+    changed) are deleted, so stale pages don't linger in the cache.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest(out_dir)
+    manifest = {} if force else dict(previous)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = await asyncio.gather(
+                *(_fetch_one(url, out_dir, manifest, executor, timeout) for url in urls), return_exceptions=True
+            )
+    finally:
+        current = {url: manifest[url] for url in urls if url in manifest}
+        save_manifest(out_dir, current)
+        _remove_stale(out_dir, previous, current)
+    return [
+        FetchResult(url, "error", f"{type(outcome).__name__}: {outcome}") if isinstance(outcome, Exception) else outcome
+        for url, outcome in zip(urls, outcomes)
+    ]
+
+
+# ─── Local stand-in server ─────────────────────────────────────────
+
+
+class _DocsHandler(BaseHTTPRequestHandler):
+    """Serves /page/<n> with a fixed ETag so conditional requests can be exercised."""
+
+    latency = 0.05
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = (
+            f"<html><head><title>{self.path}</title></head><body><nav>menu</nav>"
+            f"<h1>Page {self.path}</h1><p>Some <strong>documentation</strong> text.</p>"
+            f"<pre>example --flag</pre><ul><li>one</li><li>two</li></ul></body></html>"
+        ).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StandinServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections under high -j and skews timings with SYN retries.
+    request_queue_size = 256
+
+
+def start_standin_server() -> ThreadingHTTPServer:
+    """Start a local HTTP server on a free port in a background thread."""
+    server = _StandinServer(("127.0.0.1", 0), _DocsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_benchmark(count: int, concurrency: int) -> None:
+    server = start_standin_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/page/{n}" for n in range(count)]
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            out_dir = Path(tmp)
+            for label in ("cold", "warm"):
+                start = time.perf_counter()
+                results = asyncio.run(fetch_all(urls, out_dir, concurrency=concurrency))
+                elapsed = time.perf_counter() - start
+                print(f"{label:>5}: {elapsed:6.2f}s  {_summary(results)}")
+            start = time.perf_counter()
+            asyncio.run(fetch_all(urls, out_dir, concurrency=1, force=True))
+            print(f"{'seq':>5}: {time.perf_counter() - start:6.2f}s  (concurrency=1, no manifest)")
+    finally:
+        server.shutdown()
+
+
+# ─── CLI ───────────────────────────────────────────────────────────
+
+
+def _summary(results: list[FetchResult]) -> str:
+    counts: dict[str, int] = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return ", ".join(f"{status}={n}" for status, n in sorted(counts.items()))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readme", type=Path, default=DOCS_DIR / "README.md", help="URL list")
+    parser.add_argument("--out", type=Path, default=DOCS_DIR, help="Output directory")
+    parser.add_argument("-j", "--concurrency", type=int, default=8, help="Max in-flight requests (thread pool size)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and refetch everything")
+    parser.add_argument("--bench", type=int, metavar="N", help="Benchmark N URLs against a local server")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(args.bench, args.concurrency)
+        return 0
+
+    urls = read_urls(args.readme)
+    start = time.perf_counter()
+    results = asyncio.run(fetch_all(urls, args.out, args.concurrency, args.timeout, args.force))
+    for result in results:
+        if result.status == "error":
+            print(f"  ERROR {result.url}: {result.detail}", file=sys.stderr)
+    print(f"Fetched {len(urls)} URLs in {time.perf_counter() - start:.2f}s ({_summary(results)})")
+    return 1 if any(r.status == "error" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
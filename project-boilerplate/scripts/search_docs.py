@@ -0,0 +1,285 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.11"
+# dependencies = []
+# ///
+"""Search project docs by chunk instead of loading whole files into context.
+
+Markdown under ai_docs/, specs/, app_review/ and app_fix_reports/ is split
+into heading-aware chunks and indexed in a SQLite FTS5 table ranked with
+BM25. The index lives in .claude/data/search.sqlite and is updated
+incrementally: files are re-chunked only when their mtime/size change and
+their content hash differs.
+
+Usage:
+    uv run scripts/search_docs.py "hook permissions"          # top 5 chunks
+    uv run scripts/search_docs.py "retry logic" -k 10 --json  # for commands
+    uv run scripts/search_docs.py --rebuild                   # drop and reindex
+    uv run scripts/search_docs.py --bench 10000               # synthetic corpus timing
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+INDEX_DIRS = ("ai_docs", "specs", "app_review", "app_fix_reports")
+DB_PATH = PROJECT_ROOT / ".claude" / "data" / "search.sqlite"
+MAX_CHUNK_CHARS = 1500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunk_meta (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chunk_meta_path ON chunk_meta(path);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(heading, body, tokenize='porter unicode61');
+"""
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*\S)\s*$")
+
+
+@dataclass
+class Chunk:
+    line: int
+    heading: str
+    body: str
+
+
+# ─── Chunking ──────────────────────────────────────────────────────
+
+
+def chunk_markdown(text: str) -> list[Chunk]:
+    """Split markdown at headings, carrying the heading path into each chunk.
+
+    Sections longer than MAX_CHUNK_CHARS are split further at blank lines.
+    Headings inside fenced code blocks are ignored.
+    """
+    chunks: list[Chunk] = []
+    trail: list[tuple[int, str]] = []
+    buf: list[str] = []
+    start = 1
+    in_fence = False
+
+    def flush() -> None:
+        body = "\n".join(buf).strip()
+        if body:
+            chunks.append(Chunk(start, " > ".join(title for _, title in trail), body))
+        buf.clear()
+
+    for lineno, line in enumerate(text.splitlines(), 1):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if match:
+            flush()
+            level = len(match.group(1))
+            while trail and trail[-1][0] >= level:
+                trail.pop()
+            trail.append((level, match.group(2)))
+            start = lineno + 1
+            continue
+        if not in_fence and not line.strip() and sum(len(b) + 1 for b in buf) >= MAX_CHUNK_CHARS:
+            flush()
+            start = lineno + 1
+            continue
+        if not buf:
+            start = lineno
+        buf.append(line)
+    flush()
+    return chunks
+
+
+# ─── Index ─────────────────────────────────────────────────────────
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _delete_file(conn: sqlite3.Connection, path: str) -> None:
+    ids = [(row[0],) for row in conn.execute("SELECT id FROM chunk_meta WHERE path = ?", (path,))]
+    conn.executemany("DELETE FROM chunks WHERE rowid = ?", ids)
+    conn.execute("DELETE FROM chunk_meta WHERE path = ?", (path,))
+    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+
+def update_index(conn: sqlite3.Connection, root: Path, dirs: tuple[str, ...] = INDEX_DIRS) -> dict[str, int]:
+    """Bring the index in line with the markdown files under root/dirs."""
+    stats = {"indexed": 0, "skipped": 0, "removed": 0, "chunks": 0}
+    known = {row[0]: row[1:] for row in conn.execute("SELECT path, mtime_ns, size, sha256 FROM files")}
+    seen = set()
+
+    with conn:
+        for directory in dirs:
+            base = root / directory
+            if not base.is_dir():
+                continue
+            for file in sorted(base.rglob("*.md")):
+                rel = file.relative_to(root).as_posix()
+                seen.add(rel)
+                st = file.stat()
+                previous = known.get(rel)
+                if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+                    stats["skipped"] += 1
+                    continue
+                data = file.read_bytes()
+                digest = hashlib.sha256(data).hexdigest()
+                if previous and previous[2] == digest:
+                    conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?", (st.st_mtime_ns, st.st_size, rel)
+                    )
+                    stats["skipped"] += 1
+                    continue
+                if previous:
+                    _delete_file(conn, rel)
+                for chunk in chunk_markdown(data.decode("utf-8", errors="replace")):
+                    cursor = conn.execute("INSERT INTO chunk_meta (path, line) VALUES (?, ?)", (rel, chunk.line))
+                    conn.execute(
+                        "INSERT INTO chunks (rowid, heading, body) VALUES (?, ?, ?)",
+                        (cursor.lastrowid, chunk.heading, chunk.body),
+                    )
+                    stats["chunks"] += 1
+                conn.execute(
+                    "INSERT INTO files (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                    (rel, st.st_mtime_ns, st.st_size, digest),
+                )
+                stats["indexed"] += 1
+        for rel in set(known) - seen:
+            _delete_file(conn, rel)
+            stats["removed"] += 1
+    return stats
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 OR-query of quoted terms so punctuation can't break the syntax."""
+    terms = re.findall(r"\w+", query.lower())
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+def search(conn: sqlite3.Connection, query: str, k: int = 5) -> list[dict]:
+    """Return the top-k chunks for query, best first. Heading matches weigh double."""
+    fts = _fts_query(query)
+    if not fts:
+        return []
+    rows = conn.execute(
+        """
+        SELECT m.path, m.line, chunks.heading, chunks.body, bm25(chunks, 2.0, 1.0) AS score
+        FROM chunks JOIN chunk_meta m ON m.id = chunks.rowid
+        WHERE chunks MATCH ?
+        ORDER BY score
+        LIMIT ?
+        """,
+        (fts, k),
+    )
+    return [
+        {"path": path, "line": line, "heading": heading, "text": body, "score": round(-score, 4)}
+        for path, line, heading, body, score in rows
+    ]
+
+
+# ─── Benchmark ─────────────────────────────────────────────────────
+
+
+def run_benchmark(target_chunks: int, queries: int = 200) -> None:
+    rng = random.Random(0)
+    vocab = [f"term{n}" for n in range(5000)] + ["hook", "plan", "review", "fix", "spec", "agent", "build"]
+    sections_per_file = 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for n in range(target_chunks // sections_per_file):
+            directory = root / INDEX_DIRS[n % len(INDEX_DIRS)]
+            directory.mkdir(exist_ok=True)
+            parts = [f"# Document {n}"]
+            for s in range(sections_per_file):
+                parts.append(f"## Section {s} {rng.choice(vocab)}")
+                parts.append(" ".join(rng.choices(vocab, k=80)))
+            (directory / f"doc_{n}.md").write_text("\n\n".join(parts), encoding="utf-8")
+
+        conn = connect(root / "search.sqlite")
+        start = time.perf_counter()
+        stats = update_index(conn, root)
+        print(f"build:       {time.perf_counter() - start:7.2f}s  ({stats['indexed']} files, {stats['chunks']} chunks)")
+
+        start = time.perf_counter()
+        update_index(conn, root)
+        print(f"no-op check: {(time.perf_counter() - start) * 1000:7.1f}ms")
+
+        timings = []
+        for _ in range(queries):
+            query = " ".join(rng.choices(vocab, k=3))
+            start = time.perf_counter()
+            search(conn, query, k=5)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        print(f"query:       p50 {statistics.median(timings):.2f}ms  p99 {p99:.2f}ms  ({queries} queries, k=5)")
+        conn.close()
+
+
+# ─── CLI ───────────────────────────────────────────────────────────
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="?", help="Free-text query")
+    parser.add_argument("-k", type=int, default=5, help="Number of chunks to return")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Index location")
+    parser.add_argument("--no-update", action="store_true", help="Query without refreshing the index first")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the index and rebuild it")
+    parser.add_argument("--bench", type=int, metavar="CHUNKS", help="Benchmark on a synthetic corpus")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(args.bench)
+        return 0
+
+    if args.rebuild:
+        args.db.unlink(missing_ok=True)
+    conn = connect(args.db)
+    if not args.no_update:
+        stats = update_index(conn, PROJECT_ROOT)
+        if args.rebuild or not args.query:
+            print(f"Index: {stats['indexed']} indexed, {stats['skipped']} unchanged, {stats['removed']} removed")
+    if not args.query:
+        return 0
+
+    results = search(conn, args.query, args.k)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    if not results:
+        print("No matches.")
+    for result in results:
+        heading = f"  [{result['heading']}]" if result["heading"] else ""
+        print(f"── {result['path']}:{result['line']}{heading}  (score {result['score']})")
+        print(result["text"])
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Stand-in for `claude -p "/<stage> ..."` used by the adw_cycle tests.
+
+Behaviour is driven by environment variables:
+    FAKE_CLAUDE_LOG     append "start|end <stage> <ADW_JOB_ID> <time>" lines here
+    FAKE_CLAUDE_SLEEP   seconds to sleep inside each call (FAKE_CLAUDE_SLEEP_<STAGE> overrides it)
+    FAKE_CLAUDE_FAIL    stage name that exits non-zero
+    FAKE_CLAUDE_OUTPUT  "print" (default): write <dir>/<tag>-<n>.md and print its path
+                        "quiet": write the same file without printing it
+                        "tagged": write <dir>/<ADW_JOB_ID>-<stage>.md without printing it
+                        "twice": write and print two new files
+    FAKE_CLAUDE_MENTION extra text printed after the output path
+"""
+
+import os
+import shlex
+import sys
+import time
+from pathlib import Path
+
+OUTPUT_DIRS = {"plan": "specs", "review": "app_review", "fix": "app_fix_reports"}
+
+
+def log(event: str, stage: str) -> None:
+    path = os.environ.get("FAKE_CLAUDE_LOG")
+    if path:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"{event} {stage} {os.environ.get('ADW_JOB_ID', '-')} {time.monotonic()}\n")
+
+
+def main() -> int:
+    command = sys.argv[-1]
+    name, _, rest = command.partition(" ")
+    stage = name.lstrip("/")
+    args = shlex.split(rest)
+
+    log("start", stage)
+    sleep = os.environ.get(f"FAKE_CLAUDE_SLEEP_{stage.upper()}", os.environ.get("FAKE_CLAUDE_SLEEP", "0"))
+    time.sleep(float(sleep))
+    log("end", stage)
+    if os.environ.get("FAKE_CLAUDE_FAIL") == stage:
+        print(f"{stage} failed on purpose", file=sys.stderr)
+        return 1
+
+    directory = OUTPUT_DIRS.get(stage)
+    if not directory:
+        print(f"ran {command}")
+        return 0
+
+    mode = os.environ.get("FAKE_CLAUDE_OUTPUT", "print")
+    Path(directory).mkdir(exist_ok=True)
+    if mode == "tagged":
+        target = Path(directory) / f"{os.environ['ADW_JOB_ID']}-{stage}.md"
+    else:
+        tag = args[0].split()[0].lower() if args else stage
+        target = Path(directory) / f"{tag}-{time.monotonic_ns()}.md"
+    target.write_text(command + "\n", encoding="utf-8")
+    if mode in ("print", "twice"):
+        print(f"Wrote {target.as_posix()}")
+    if mode == "twice":
+        extra = target.with_name(f"extra-{target.name}")
+        extra.write_text(command + "\n", encoding="utf-8")
+        print(f"Wrote {extra.as_posix()}")
+    if os.environ.get("FAKE_CLAUDE_MENTION"):
+        print(os.environ["FAKE_CLAUDE_MENTION"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent
+SCRIPT = TESTS_DIR.parent / "scripts" / "adw_cycle.py"
+FAKE_CLAUDE = f"{shlex.quote(sys.executable)} {shlex.quote(str(TESTS_DIR / 'fake_claude.py'))}"
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A scratch project root: adw_cycle resolves specs/, app_review/ etc. next to its scripts/ dir."""
+    (tmp_path / "scripts").mkdir()
+    shutil.copy(SCRIPT, tmp_path / "scripts" / "adw_cycle.py")
+    for directory in ("specs", "app_review", "app_fix_reports"):
+        (tmp_path / directory).mkdir()
+    return tmp_path
+
+
+def run(project: Path, *args: str, **fake_env: str) -> subprocess.CompletedProcess:
+    env = os.environ | {"FAKE_CLAUDE_LOG": str(project / "calls.log")} | fake_env
+    return subprocess.run(
+        [sys.executable, str(project / "scripts" / "adw_cycle.py"), *args, "--claude", FAKE_CLAUDE],
+        cwd=project,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def read_state(project: Path) -> dict:
+    return json.loads((project / ".claude" / "data" / "adw_cycle.json").read_text())
+
+
+def read_calls(project: Path) -> list[tuple[str, str, str, float]]:
+    path = project / "calls.log"
+    if not path.exists():
+        return []
+    calls = []
+    for line in path.read_text().splitlines():
+        event, stage, job_id, at = line.split()
+        calls.append((event, stage, job_id, float(at)))
+    return calls
+
+
+def max_concurrency(calls, stage: str) -> int:
+    events = sorted((at, 1 if event == "start" else -1) for event, s, _, at in calls if s == stage)
+    running = peak = 0
+    for _, delta in events:
+        running += delta
+        peak = max(peak, running)
+    return peak
+
+
+def test_stages_run_in_order_and_chain_outputs(project):
+    proc = run(project, "alpha feature")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    starts = [stage for event, stage, _, _ in read_calls(project) if event == "start"]
+    assert starts == ["plan", "build", "review", "fix"]
+
+    (job,) = read_state(project).values()
+    stages = job["stages"]
+    assert all(stages[stage]["status"] == "done" for stage in ("plan", "build", "review", "fix"))
+    plan, review = stages["plan"]["output"], stages["review"]["output"]
+    assert plan.startswith("specs/alpha-")
+    assert review.startswith("app_review/alpha-")
+    assert (project / stages["fix"]["output"]).read_text().split()[-2:] == [plan, review]
+
+
+def test_spec_input_skips_plan(project):
+    (project / "specs" / "given.md").write_text("# Given\n")
+    proc = run(project, "specs/given.md", "--stages", "build")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert [stage for event, stage, _, _ in read_calls(project) if event == "start"] == ["build"]
+
+
+def test_failed_stage_is_retried_and_done_stages_skipped(project):
+    first = run(project, "beta feature", FAKE_CLAUDE_FAIL="review")
+    assert first.returncode == 1
+    (job,) = read_state(project).values()
+    assert job["stages"]["review"]["status"] == "failed"
+    assert "fix" not in job["stages"]
+
+    (project / "calls.log").unlink()
+    second = run(project, "beta feature")
+    assert second.returncode == 0, second.stdout + second.stderr
+    starts = [stage for event, stage, _, _ in read_calls(project) if event == "start"]
+    assert starts == ["review", "fix"]
+    assert "plan: already done, skipping" in second.stdout
+    assert "build: already done, skipping" in second.stdout
+
+
+def test_stage_limits_are_honored(project):
+    prompts = [f"job{n} feature" for n in range(4)]
+    proc = run(project, *prompts, "-j", "4", "--limit", "build=1", FAKE_CLAUDE_SLEEP="0.2")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    calls = read_calls(project)
+    assert max_concurrency(calls, "build") == 1
+    assert max_concurrency(calls, "plan") > 1
+
+
+def test_outputs_are_attributed_to_their_own_job(project):
+    prompts = ["alpha x", "beta x", "gamma x", "delta x"]
+    proc = run(project, *prompts, "--stages", "plan", FAKE_CLAUDE_SLEEP="0.1")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    for job in read_state(project).values():
+        tag = job["input"].split()[0]
+        assert job["stages"]["plan"]["output"].startswith(f"specs/{tag}-")
+
+
+def test_job_tagged_outputs_are_attributed_without_printed_path(project):
+    proc = run(project, "alpha x", "beta x", "--stages", "plan", FAKE_CLAUDE_OUTPUT="tagged", FAKE_CLAUDE_SLEEP="0.1")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    for job_id, job in read_state(project).items():
+        assert job["stages"]["plan"]["output"] == f"specs/{job_id}-plan.md"
+
+
+def test_unattributable_output_fails_instead_of_guessing(project):
+    prompts = ["alpha x", "beta x", "gamma x", "delta x"]
+    proc = run(project, *prompts, "--stages", "plan", FAKE_CLAUDE_OUTPUT="quiet", FAKE_CLAUDE_SLEEP="0.1")
+    assert proc.returncode == 1
+
+    for job in read_state(project).values():
+        assert job["stages"]["plan"]["status"] == "failed"
+        assert "did not print" in job["stages"]["plan"]["error"]
+
+
+def test_busy_stage_does_not_block_other_jobs_plans(project):
+    prompts = [f"job{n} feature" for n in range(4)]
+    proc = run(
+        project,
+        *prompts,
+        "-j",
+        "2",
+        "--stages",
+        "plan,build",
+        "--limit",
+        "build=1",
+        FAKE_CLAUDE_SLEEP="0.05",
+        FAKE_CLAUDE_SLEEP_BUILD="0.6",
+    )
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    calls = read_calls(project)
+    last_plan_end = max(at for event, stage, _, at in calls if event == "end" and stage == "plan")
+    build_starts = sorted(at for event, stage, _, at in calls if event == "start" and stage == "build")
+    assert last_plan_end < build_starts[1]
+
+
+def test_printed_path_that_existed_before_is_ignored(project):
+    (project / "specs" / "old.md").write_text("# Old\n")
+    proc = run(project, "alpha x", "--stages", "plan", FAKE_CLAUDE_MENTION="See also specs/old.md")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+
+    (job,) = read_state(project).values()
+    assert job["stages"]["plan"]["output"].startswith("specs/alpha-")
+
+
+def test_several_new_printed_paths_fail_as_ambiguous(project):
+    proc = run(project, "alpha x", "--stages", "plan", FAKE_CLAUDE_OUTPUT="twice")
+    assert proc.returncode == 1
+
+    (job,) = read_state(project).values()
+    assert job["stages"]["plan"]["status"] == "failed"
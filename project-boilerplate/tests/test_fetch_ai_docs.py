@@ -0,0 +1,129 @@
+import asyncio
+import json
+import threading
+from http.server import ThreadingHTTPServer
+
+import fetch_ai_docs
+import pytest
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(fetch_ai_docs._DocsHandler, "latency", 0)
+    server = fetch_ai_docs.start_standin_server()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+class _BogusCharsetHandler(fetch_ai_docs._DocsHandler):
+    def do_GET(self):  # noqa: N802
+        body = b"<h1>Bogus</h1><p>caf\xc3\xa9</p>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=x-bogus")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_doc_filename_distinguishes_host_and_query():
+    urls = ["https://a.com/docs/x", "https://b.com/docs/x", "https://a.com/docs/x?v=2"]
+    names = [fetch_ai_docs.doc_filename(url) for url in urls]
+    assert len(set(names)) == 3
+    assert names[0].startswith("a-com-docs-x-")
+
+
+def test_second_run_is_conditional(server, tmp_path):
+    urls = [f"{server}/page/{n}" for n in range(3)]
+
+    first = asyncio.run(fetch_ai_docs.fetch_all(urls, tmp_path))
+    assert [r.status for r in first] == ["updated"] * 3
+    manifest = json.loads((tmp_path / fetch_ai_docs.MANIFEST_NAME).read_text())
+    assert set(manifest) == set(urls)
+    for url in urls:
+        assert manifest[url]["etag"]
+        assert "# Page /page/" in (tmp_path / manifest[url]["file"]).read_text()
+
+    second = asyncio.run(fetch_ai_docs.fetch_all(urls, tmp_path))
+    assert [r.status for r in second] == ["not-modified"] * 3
+
+
+def test_missing_file_forces_refetch(server, tmp_path):
+    url = f"{server}/page/0"
+    asyncio.run(fetch_ai_docs.fetch_all([url], tmp_path))
+    (tmp_path / fetch_ai_docs.doc_filename(url)).unlink()
+
+    results = asyncio.run(fetch_ai_docs.fetch_all([url], tmp_path))
+    assert results[0].status == "updated"
+    assert (tmp_path / fetch_ai_docs.doc_filename(url)).exists()
+
+
+def test_unknown_charset_falls_back_to_utf8(tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BogusCharsetHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/bogus"
+    try:
+        results = asyncio.run(fetch_ai_docs.fetch_all([url], tmp_path))
+    finally:
+        server.shutdown()
+    assert results[0].status == "updated"
+    assert "café" in (tmp_path / fetch_ai_docs.doc_filename(url)).read_text(encoding="utf-8")
+
+
+def test_per_url_failure_keeps_run_and_manifest(server, tmp_path, monkeypatch):
+    good, bad = f"{server}/page/good", f"{server}/page/bad"
+    real = fetch_ai_docs.html_to_markdown
+
+    def flaky(html):
+        if "/page/bad" in html:
+            raise ValueError("conversion failed")
+        return real(html)
+
+    monkeypatch.setattr(fetch_ai_docs, "html_to_markdown", flaky)
+    results = asyncio.run(fetch_ai_docs.fetch_all([good, bad], tmp_path))
+
+    assert [r.status for r in results] == ["updated", "error"]
+    assert "conversion failed" in results[1].detail
+    manifest = json.loads((tmp_path / fetch_ai_docs.MANIFEST_NAME).read_text())
+    assert list(manifest) == [good]
+
+
+def test_urls_dropped_from_readme_lose_their_files(server, tmp_path):
+    kept, dropped = f"{server}/page/kept", f"{server}/page/dropped"
+    asyncio.run(fetch_ai_docs.fetch_all([kept, dropped], tmp_path))
+    assert (tmp_path / fetch_ai_docs.doc_filename(dropped)).exists()
+
+    asyncio.run(fetch_ai_docs.fetch_all([kept], tmp_path))
+    assert not (tmp_path / fetch_ai_docs.doc_filename(dropped)).exists()
+    assert (tmp_path / fetch_ai_docs.doc_filename(kept)).exists()
+    manifest = json.loads((tmp_path / fetch_ai_docs.MANIFEST_NAME).read_text())
+    assert list(manifest) == [kept]
+
+
+class _CountingHandler(fetch_ai_docs._DocsHandler):
+    latency = 0.3
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):  # noqa: N802
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+
+def test_concurrency_is_not_capped_by_default_executor(tmp_path):
+    server = fetch_ai_docs._StandinServer(("127.0.0.1", 0), _CountingHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        asyncio.run(fetch_ai_docs.fetch_all([f"{base}/page/{n}" for n in range(48)], tmp_path, concurrency=48))
+    finally:
+        server.shutdown()
+    assert _CountingHandler.peak > 32
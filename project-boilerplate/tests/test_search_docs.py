@@ -0,0 +1,87 @@
+import os
+
+import pytest
+import search_docs
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = search_docs.connect(tmp_path / "index.sqlite")
+    yield conn
+    conn.close()
+
+
+def test_chunks_carry_heading_path():
+    text = "# Guide\nintro\n## Setup\nsetup text\n### Linux\nlinux text\n## Usage\nusage text\n"
+    chunks = search_docs.chunk_markdown(text)
+    assert [(c.heading, c.body) for c in chunks] == [
+        ("Guide", "intro"),
+        ("Guide > Setup", "setup text"),
+        ("Guide > Setup > Linux", "linux text"),
+        ("Guide > Usage", "usage text"),
+    ]
+    assert chunks[1].line == 4
+
+
+def test_hash_lines_in_fences_are_not_headings():
+    text = "# Script\n```bash\n# install deps\nuv sync\n```\nafter\n"
+    chunks = search_docs.chunk_markdown(text)
+    assert len(chunks) == 1
+    assert chunks[0].heading == "Script"
+    assert "# install deps" in chunks[0].body
+
+
+def test_long_sections_split_at_blank_lines(monkeypatch):
+    monkeypatch.setattr(search_docs, "MAX_CHUNK_CHARS", 50)
+    paragraphs = [f"paragraph {n} " + "x" * 40 for n in range(4)]
+    chunks = search_docs.chunk_markdown("# Long\n" + "\n\n".join(paragraphs))
+    assert len(chunks) == 4
+    assert all(c.heading == "Long" for c in chunks)
+    assert chunks[2].body == paragraphs[2]
+
+
+def _write(root, rel, text):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_update_index_is_incremental(tmp_path, conn):
+    root = tmp_path / "project"
+    spec = _write(root, "specs/login.md", "# Login\nadd oauth login\n")
+    _write(root, "ai_docs/hooks.md", "# Hooks\npre tool use hooks\n")
+
+    stats = search_docs.update_index(conn, root)
+    assert (stats["indexed"], stats["skipped"]) == (2, 0)
+    assert search_docs.search(conn, "oauth")[0]["path"] == "specs/login.md"
+
+    stats = search_docs.update_index(conn, root)
+    assert (stats["indexed"], stats["skipped"]) == (0, 2)
+
+    # Touched but identical content: skipped by hash, not re-chunked.
+    stat = spec.stat()
+    os.utime(spec, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    stats = search_docs.update_index(conn, root)
+    assert (stats["indexed"], stats["skipped"]) == (0, 2)
+
+    spec.write_text("# Login\nadd passkey login\n", encoding="utf-8")
+    os.utime(spec, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    stats = search_docs.update_index(conn, root)
+    assert stats["indexed"] == 1
+    assert search_docs.search(conn, "oauth") == []
+    assert search_docs.search(conn, "passkey")[0]["path"] == "specs/login.md"
+    assert conn.execute("SELECT COUNT(*) FROM chunk_meta").fetchone()[0] == 2
+
+    spec.unlink()
+    stats = search_docs.update_index(conn, root)
+    assert stats["removed"] == 1
+    assert search_docs.search(conn, "passkey") == []
+    assert conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 1
+
+
+def test_search_tolerates_punctuation(tmp_path, conn):
+    _write(tmp_path, "specs/a.md", "# Retry\nexponential backoff\n")
+    search_docs.update_index(conn, tmp_path)
+    assert search_docs.search(conn, 'backoff" OR (') != []
+    assert search_docs.search(conn, "!!!") == []